@@ -12,6 +12,7 @@ bl_info = {
 import bpy
 import os
 import re
+import numpy as np
 from mathutils import Vector
 
 ROOT_PATH = r"E:\Work\City Engine\Default Workspace\Adelaide\assets\Trees"
@@ -19,65 +20,116 @@ STYLES = ["Schematic","LowPoly","Fan","Realistic"]
 STYLE_REGEX = re.compile(r"_LOD\d+", re.IGNORECASE)
 
 # ------------ Helpers ------------
+# Name-keyed material cache; bpy.data.materials.get scans the datablock
+# list per call, a dict hit does not. Cleared on file load.
+_MAT_CACHE = {}
+
+def _get_material(name):
+    m = _MAT_CACHE.get(name)
+    try:
+        if m is not None and m.name == name:
+            return m
+    except ReferenceError:
+        pass
+    m = bpy.data.materials.get(name)
+    if m is None:
+        m = bpy.data.materials.new(name)
+    _MAT_CACHE[name] = m
+    return m
+
+# One shared TextCurve per distinct (body, size) label instead of a new
+# datablock per bpy.ops.object.text_add call.
+_TEXT_DATA_CACHE = {}
+
+def _get_text_data(body, size):
+    key = (body, size)
+    data = _TEXT_DATA_CACHE.get(key)
+    try:
+        if data is not None and data.body == body:
+            return data
+    except ReferenceError:
+        pass
+    data = bpy.data.curves.new(name=f"LabelData_{body}", type='FONT')
+    data.body = body
+    data.size = size
+    data.extrude = 0.05
+    _TEXT_DATA_CACHE[key] = data
+    return data
+
+@bpy.app.handlers.persistent
+def _clear_material_cache(_dummy):
+    _MAT_CACHE.clear()
+    _TEXT_DATA_CACHE.clear()
+
 def grid_cell_center(x, y, s):
-    return Vector((x*s + s/2, -y*s - s/2, 0))
+    h = s*0.5
+    return (x*s + h, -y*s - h, 0.0)
 
 def make_checkerboard(cols, rows, spacing):
-    mat_light = bpy.data.materials.get("CheckerLight")
-    if not mat_light:
-        mat_light = bpy.data.materials.new("CheckerLight")
+    if cols == 0 or rows == 0:
+        return
+    mat_light = _get_material("CheckerLight")
     mat_light.diffuse_color = (0.8,0.8,0.8,1)
-    mat_dark = bpy.data.materials.get("CheckerDark")
-    if not mat_dark:
-        mat_dark = bpy.data.materials.new("CheckerDark")
+    mat_dark = _get_material("CheckerDark")
     mat_dark.diffuse_color = (0.3,0.3,0.3,1)
+    verts = [(cx*spacing, -cy*spacing, 0.0) for cx in range(cols+1) for cy in range(rows+1)]
+    stride = rows + 1
+    faces = []
     for cx in range(cols):
         for cy in range(rows):
-            bpy.ops.mesh.primitive_plane_add(size=spacing, location=(cx*spacing+spacing/2, -cy*spacing-spacing/2, 0))
-            plane = bpy.context.active_object
-            plane.name = f"Cell_{cx}_{cy}"
-            plane.data.materials.append(mat_light if (cx+cy)%2==0 else mat_dark)
+            # Wound counter-clockwise seen from +Z (y decreases along the
+            # stride axis here), so the board faces up.
+            a = cx*stride + cy
+            faces.append((a, a+1, a+stride+1, a+stride))
+    mesh = bpy.data.meshes.new("CheckerBoard")
+    mesh.from_pydata(verts, [], faces)
+    mesh.materials.append(mat_light)
+    mesh.materials.append(mat_dark)
+    idx = np.arange(cols * rows)
+    mesh.polygons.foreach_set("material_index", ((idx // rows + idx % rows) & 1).astype(np.int32))
+    mesh.update()
+    board = bpy.data.objects.new("CheckerBoard", mesh)
+    bpy.context.scene.collection.objects.link(board)
 
 def spaced_name(n: str) -> str:
-    return re.sub(r"(?<!^)(?=[A-Z])"," ", n)
+    if not n:
+        return n
+    out = [n[0]]
+    append = out.append
+    for ch in n[1:]:
+        if 'A' <= ch <= 'Z':
+            append(' ')
+        append(ch)
+    return ''.join(out)
 
 def get_or_make_text_material(color, name="TreeTextMaterial"):
-    m = bpy.data.materials.get(name)
-    if not m:
-        m = bpy.data.materials.new(name)
+    m = _get_material(name)
     if len(color) == 3:
         color = (color[0], color[1], color[2], 1.0)
     m.diffuse_color = color
     return m
 
 def add_text(loc, text, size, mat):
-    bpy.ops.object.text_add(location=loc)
-    t = bpy.context.active_object
-    t.data.body = text
-    t.data.extrude = 0.05
-    t.data.size = size
-    t.name = f"Label_{text}"
-    if t.data.materials:
-        t.data.materials[0] = mat
+    data = _get_text_data(text, size)
+    t = bpy.data.objects.new(f"Label_{text}", data)
+    bpy.context.scene.collection.objects.link(t)
+    t.location = loc
+    if data.materials:
+        data.materials[0] = mat
     else:
-        t.data.materials.append(mat)
+        data.materials.append(mat)
     return t
 
 def compute_world_bbox(objs):
-    coords = []
-    for obj in objs:
-        try:
-            bb = obj.bound_box
-        except:
-            bb = None
-        if bb is None:
-            continue
-        for v in bb:
-            coords.append(obj.matrix_world @ Vector(v))
-    if not coords:
+    objs = [o for o in objs if getattr(o, "bound_box", None) is not None]
+    if not objs:
         return None, None, None
-    min_corner = Vector((min(c.x for c in coords), min(c.y for c in coords), min(c.z for c in coords)))
-    max_corner = Vector((max(c.x for c in coords), max(c.y for c in coords), max(c.z for c in coords)))
+    mats = np.array([np.array(o.matrix_world) for o in objs], dtype=np.float32)
+    corners = np.array([o.bound_box for o in objs], dtype=np.float32)
+    corners_h = np.concatenate([corners, np.ones((len(objs), 8, 1), dtype=np.float32)], axis=2)
+    world = np.einsum('nij,nkj->nki', mats, corners_h)[..., :3].reshape(-1, 3)
+    min_corner = Vector(world.min(axis=0).tolist())
+    max_corner = Vector(world.max(axis=0).tolist())
     center = (min_corner + max_corner) / 2.0
     return min_corner, max_corner, center
 
@@ -92,12 +144,22 @@ def align_group_with_empty(imported_objs, cell_x, cell_y, spacing, group_name, c
     if center is None:
         return empty
     target = grid_cell_center(cell_x, cell_y, spacing)
-    offset = Vector((target.x - center.x, target.y - center.y, -min_corner.z))
+    offset = Vector((target[0] - center.x, target[1] - center.y, -min_corner.z))
     empty.location += offset
+    # Cache the aligned world bbox on the Empty so later label placement
+    # doesn't traverse every bound_box again.
+    empty["_bbox_min"] = list(min_corner + offset)
+    empty["_bbox_max"] = list(max_corner + offset)
     return empty
 
 def add_text_above_group(objs, text, size, offset, mat):
-    min_corner, max_corner, center = compute_world_bbox(objs)
+    parent = objs[0].parent if objs else None
+    if parent is not None and "_bbox_min" in parent:
+        min_corner = Vector(parent["_bbox_min"])
+        max_corner = Vector(parent["_bbox_max"])
+        center = (min_corner + max_corner) / 2.0
+    else:
+        min_corner, max_corner, center = compute_world_bbox(objs)
     if center is None:
         center = Vector((0,0,0))
         max_corner = Vector((0,0,0))
@@ -129,7 +191,8 @@ class TREE_OT_import_grid(bpy.types.Operator):
         for style in STYLES:
             folder = os.path.join(ROOT_PATH, style)
             if os.path.isdir(folder):
-                allf[style] = [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.lower().endswith(".glb")]
+                with os.scandir(folder) as it:
+                    allf[style] = sorted(e.path for e in it if e.is_file() and e.name[-4:].lower() == ".glb")
 
         if not allf:
             self.report({'WARNING'}, "No style folders found.")
@@ -146,31 +209,32 @@ class TREE_OT_import_grid(bpy.types.Operator):
             coll = bpy.data.collections.new(style)
             ctx.scene.collection.children.link(coll)
 
-            for r, fpath in enumerate(files):
-                try:
-                    bpy.ops.import_scene.gltf(filepath=fpath)
-                    imported = list(ctx.selected_objects)
-
-                    for o in imported:
-                        for c in list(o.users_collection):
-                            if c != coll:
-                                c.objects.unlink(o)
-                        if o.name not in coll.objects:
-                            coll.objects.link(o)
+            # Import with the style collection active so new objects land
+            # there directly — no per-object unlink/relink pass needed.
+            prev_active = ctx.view_layer.active_layer_collection
+            ctx.view_layer.active_layer_collection = ctx.view_layer.layer_collection.children[coll.name]
+            try:
+                for r, fpath in enumerate(files):
+                    try:
+                        pre_uids = {o.session_uid for o in bpy.data.objects}
+                        bpy.ops.import_scene.gltf(filepath=fpath, import_shading='FLAT')
+                        imported = [o for o in bpy.data.objects if o.session_uid not in pre_uids]
 
-                    align_group_with_empty(imported, col, r, s, os.path.basename(fpath), coll)
+                        align_group_with_empty(imported, col, r, s, os.path.basename(fpath), coll)
 
-                    if imported and mode in ['MODEL','BOTH']:
-                        name = os.path.splitext(os.path.basename(fpath))[0]
-                        add_text_above_group(imported, spaced_name(name), ts, to, tmat)
+                        if imported and mode in ['MODEL','BOTH']:
+                            name = os.path.splitext(os.path.basename(fpath))[0]
+                            add_text_above_group(imported, spaced_name(name), ts, to, tmat)
 
-                    total += 1
-                except Exception as e:
-                    self.report({'ERROR'}, f"Failed {fpath}: {e}")
+                        total += 1
+                    except Exception as e:
+                        self.report({'ERROR'}, f"Failed {fpath}: {e}")
+            finally:
+                ctx.view_layer.active_layer_collection = prev_active
 
             if mode in ['FOLDER','BOTH']:
-                loc = grid_cell_center(col, len(files), s); loc.z = to
-                add_text(loc, spaced_name(style), ts, tmat)
+                cx, cy, _ = grid_cell_center(col, len(files), s)
+                add_text((cx, cy, to), spaced_name(style), ts, tmat)
 
         self.report({'INFO'}, f"Imported {total} models.")
         return {'FINISHED'}
@@ -223,9 +287,13 @@ def register():
     for c in classes:
         bpy.utils.register_class(c)
     bpy.types.Scene.tree_grid_props = bpy.props.PointerProperty(type=TreeGridProperties)
+    if _clear_material_cache not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_material_cache)
     print("✅ Tree Grid Importer loaded.")
 
 def unregister():
+    if _clear_material_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_material_cache)
     for c in reversed(classes):
         bpy.utils.unregister_class(c)
     if hasattr(bpy.types, "Scene") and hasattr(bpy.types.Scene, "tree_grid_props"):
@@ -1,7 +1,7 @@
 import bpy
 import mathutils
 import random
-import bmesh
+import numpy as np
 
 # ------------------------------
 # ADDON METADATA
@@ -96,30 +96,27 @@ class OBJECT_OT_MoveReferenceToOrigin(bpy.types.Operator):
         bpy.ops.object.select_all(action='DESELECT')
         ref_obj.select_set(True)
         
-        # Calculate geometry center using bmesh
-        bm = bmesh.new()
-        bm.from_mesh(ref_obj.data)
-        
-        # Calculate center of geometry
-        if bm.verts:
-            geometry_center = sum((v.co for v in bm.verts), mathutils.Vector()) / len(bm.verts)
+        # Calculate the geometry center and recenter the vertices in bulk.
+        # foreach_get/foreach_set move the coordinates to and from a flat
+        # NumPy array in C, so no per-vertex Python loop (or bmesh copy)
+        # is involved.
+        me = ref_obj.data
+        vert_count = len(me.vertices)
+        if vert_count:
+            coords = np.empty(vert_count * 3, dtype=np.float32)
+            me.vertices.foreach_get("co", coords)
+            coords = coords.reshape(-1, 3)
+            geometry_center = coords.mean(axis=0)
+            coords -= geometry_center
+            me.vertices.foreach_set("co", coords.ravel())
+            me.update()
+            geometry_center = mathutils.Vector(geometry_center.tolist())
         else:
             geometry_center = mathutils.Vector((0, 0, 0))
-        
+
         # Transform geometry center to world coordinates
         geometry_center_world = ref_obj.matrix_world @ geometry_center
         
-        # Move all vertices to center the geometry around origin
-        for v in bm.verts:
-            v.co -= geometry_center
-        
-        # Update the mesh
-        bm.to_mesh(ref_obj.data)
-        bm.free()
-        
-        # Update the object
-        ref_obj.data.update()
-        
         # Now move the reference object to global origin
         ref_obj.location = mathutils.Vector((0, 0, 0))
         
@@ -130,12 +127,17 @@ class OBJECT_OT_MoveReferenceToOrigin(bpy.types.Operator):
         global scene_offset_vector
         scene_offset_vector = offset_vector
         
-        # Move all other mesh objects relative to the reference
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH' and obj != ref_obj:
-                obj.location += offset_vector
-
-        self.report({'INFO'}, f"Centered {ref_obj.name} at origin and repositioned {len([o for o in bpy.context.scene.objects if o.type == 'MESH'])} mesh objects.")
+        # Move all other mesh objects relative to the reference. The new
+        # locations are computed in one NumPy batch; the write-back stays
+        # per object since Object.location has no foreach_set.
+        other_meshes = [o for o in bpy.context.scene.objects if o.type == 'MESH' and o is not ref_obj]
+        if other_meshes:
+            locs = np.array([o.location for o in other_meshes], dtype=np.float32)
+            locs += np.asarray(offset_vector, dtype=np.float32)
+            for obj, loc in zip(other_meshes, locs):
+                obj.location = loc
+
+        self.report({'INFO'}, f"Centered {ref_obj.name} at origin and repositioned {len(other_meshes) + 1} mesh objects.")
         return {'FINISHED'}
 
 
@@ -157,10 +159,14 @@ class OBJECT_OT_RegisterNewMeshes(bpy.types.Operator):
             return {'CANCELLED'}
 
         stored_names = {name for name, _ in original_positions_store}
-        
+
+        # Iterate bpy.data.objects (flat datablock array) rather than the
+        # slower scene.objects walk; membership in the scene is checked
+        # against a set snapshot taken once.
+        scene_names = {obj.name for obj in context.scene.objects}
         new_meshes = []
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH' and obj.name not in stored_names:
+        for obj in bpy.data.objects:
+            if obj.type == 'MESH' and obj.name in scene_names and obj.name not in stored_names:
                 new_meshes.append(obj)
 
         if not new_meshes:
@@ -198,22 +204,27 @@ class OBJECT_OT_RestoreOriginalPosition(bpy.types.Operator):
             return {'CANCELLED'}
 
         restored_count = 0
+        # One name->object map instead of a bpy.data.objects.get per stored
+        # entry; .get scans the datablock list on every call.
+        obj_map = {obj.name: obj for obj in bpy.data.objects}
         # Restore original positions
         for name, orig_loc in original_positions_store:
-            obj = bpy.data.objects.get(name)
+            obj = obj_map.get(name)
             if obj:
-                original_location_before_restore = obj.location.copy()
                 obj.location = orig_loc
-                print(f"Restoring {name}: from {original_location_before_restore} to {obj.location}")
                 restored_count += 1
 
-        # Restore original geometry for reference objects
+        # Restore original geometry for reference objects. The replaced
+        # meshes are freed after the loop so the datablock removals (and
+        # the depsgraph tags they trigger) happen in one batch.
+        old_meshes = []
         for obj_name, original_mesh in original_geometry_store.items():
-            obj = bpy.data.objects.get(obj_name)
+            obj = obj_map.get(obj_name)
             if obj and obj.data:
-                old_mesh = obj.data
+                old_meshes.append(obj.data)
                 obj.data = original_mesh
-                bpy.data.meshes.remove(old_mesh)
+        for old_mesh in old_meshes:
+            bpy.data.meshes.remove(old_mesh)
 
         # Clear stored data
         original_positions_store.clear()
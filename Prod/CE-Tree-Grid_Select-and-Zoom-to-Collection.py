@@ -13,22 +13,44 @@ import bpy
 import os
 import re
 import sys
-from collections import Counter
+import numpy as np
 from mathutils import Vector
 
 STYLE_ORDER = ["Schematic", "LowPoly", "Fan", "Realistic"]
 STYLE_REGEX = re.compile(r"(schematic|lowpoly|fan|realistic)", re.IGNORECASE)
-LOD_REGEX = re.compile(r"_LOD\\d+", re.IGNORECASE)
+LOD_REGEX = re.compile(r"_LOD\d+", re.IGNORECASE)
+SEPARATOR_REGEX = re.compile(r"[_\-\s]+")
+SPACED_NAME_REGEX = re.compile(r"(?<!^)(?=[A-Z])")
 
 
 # --- Helpers ---
+# Heuristic results for collections without the explicit tag, keyed by
+# collection name. UI redraws hit this cache; a depsgraph handler clears
+# it when collections or objects actually change.
+_CE_TREE_CACHE = {}
+
+# Cached enum items for the tree selector. Keeping a module-level
+# reference is also required for correctness: Blender does not hold on
+# to the strings an items callback returns.
+_ENUM_ITEMS_CACHE = None
+
+@bpy.app.handlers.persistent
+def _invalidate_ce_tree_cache(scene, depsgraph):
+    global _ENUM_ITEMS_CACHE
+    if depsgraph.id_type_updated('COLLECTION') or depsgraph.id_type_updated('OBJECT'):
+        _CE_TREE_CACHE.clear()
+        _ENUM_ITEMS_CACHE = None
+
+
 def is_ce_tree_collection(coll):
     if coll.get("ce_tree_grid", False):
         return True
-    for obj in coll.objects:
-        if obj.type == "FONT" and obj.name.startswith("Label_"):
-            return True
-    return False
+    cached = _CE_TREE_CACHE.get(coll.name)
+    if cached is not None:
+        return cached
+    result = any(obj.type == "FONT" and obj.name.startswith("Label_") for obj in coll.objects)
+    _CE_TREE_CACHE[coll.name] = result
+    return result
 
 
 def grid_cell_center(cell_x, cell_y, spacing):
@@ -44,15 +66,24 @@ def make_checkerboard(cols, rows, spacing):
     if not mat_dark:
         mat_dark = bpy.data.materials.new("CheckerDark")
         mat_dark.diffuse_color = (0.3, 0.3, 0.3, 1)
+    # Two shared quad meshes (light/dark), each carrying its material;
+    # cells just alias one of them, leaving no per-cell material work.
+    half = spacing * 0.5
+    quad_verts = [(-half, -half, 0.0), (half, -half, 0.0), (half, half, 0.0), (-half, half, 0.0)]
+    quad_face = [(0, 1, 2, 3)]
+    meshes = []
+    for mesh_name, mat in (("CheckerCellLight", mat_light), ("CheckerCellDark", mat_dark)):
+        mesh = bpy.data.meshes.new(mesh_name)
+        mesh.from_pydata(quad_verts, [], quad_face)
+        mesh.materials.append(mat)
+        mesh.update()
+        meshes.append(mesh)
+    scene_objects = bpy.context.scene.collection.objects
     for x in range(cols):
         for y in range(rows):
-            bpy.ops.mesh.primitive_plane_add(
-                size=spacing,
-                location=(x * spacing + spacing / 2, -y * spacing - spacing / 2, 0),
-            )
-            plane = bpy.context.active_object
-            plane.name = f"Cell_{x}_{y}"
-            plane.data.materials.append(mat_light if (x + y) % 2 == 0 else mat_dark)
+            obj = bpy.data.objects.new(f"Cell_{x}_{y}", meshes[(x + y) % 2])
+            obj.location = (x * spacing + half, -y * spacing - half, 0.0)
+            scene_objects.link(obj)
 
 
 def clean_base_name(filenames):
@@ -61,15 +92,18 @@ def clean_base_name(filenames):
         name = os.path.splitext(os.path.basename(fn))[0]
         name = STYLE_REGEX.sub("", name)
         name = LOD_REGEX.sub("", name)
-        name = re.sub(r"[_\\-\\s]+", "", name)
+        name = SEPARATOR_REGEX.sub("", name)
         cleaned.append(name)
     if not cleaned:
         return "UnknownTree"
-    return Counter(cleaned).most_common(1)[0][0]
+    counts = {}
+    for n in cleaned:
+        counts[n] = counts.get(n, 0) + 1
+    return max(counts, key=counts.get)
 
 
 def spaced_name(name):
-    return re.sub(r"(?<!^)(?=[A-Z])", " ", name)
+    return SPACED_NAME_REGEX.sub(" ", name)
 
 
 def align_group_with_empty(imported_objs, cell_x, cell_y, spacing, style_name, tree_collection):
@@ -80,21 +114,22 @@ def align_group_with_empty(imported_objs, cell_x, cell_y, spacing, style_name, t
     for obj in imported_objs:
         obj.parent = style_empty
 
-    all_coords = []
-    for obj in imported_objs:
-        for v in obj.bound_box:
-            all_coords.append(obj.matrix_world @ Vector(v))
-    if all_coords:
-        min_corner = Vector((min(v.x for v in all_coords),
-                             min(v.y for v in all_coords),
-                             min(v.z for v in all_coords)))
-        max_corner = Vector((max(v.x for v in all_coords),
-                             max(v.y for v in all_coords),
-                             max(v.z for v in all_coords)))
-        center = (min_corner + max_corner) / 2.0
-        target = grid_cell_center(cell_x, cell_y, spacing)
-        offset = Vector((target.x - center.x, target.y - center.y, -min_corner.z))
-        style_empty.location += offset
+    # Compute the group AABB in world space in one vectorized pass.
+    n = len(imported_objs)
+    mats = np.array([list(obj.matrix_world) for obj in imported_objs], dtype=np.float32)
+    corners = np.array([[list(v) for v in obj.bound_box] for obj in imported_objs], dtype=np.float32)
+    corners_h = np.concatenate([corners, np.ones((n, 8, 1), dtype=np.float32)], axis=2)
+    world = np.einsum('nij,nkj->nki', mats, corners_h)[..., :3].reshape(-1, 3)
+    min_corner = Vector(world.min(axis=0).tolist())
+    max_corner = Vector(world.max(axis=0).tolist())
+    center = (min_corner + max_corner) / 2.0
+    target = grid_cell_center(cell_x, cell_y, spacing)
+    offset = Vector((target.x - center.x, target.y - center.y, -min_corner.z))
+    style_empty.location += offset
+    # Keep the aligned bbox on the Empty so re-alignment or labelling
+    # never has to re-iterate the group's bound boxes.
+    style_empty["_bbox_min"] = list(min_corner + offset)
+    style_empty["_bbox_max"] = list(max_corner + offset)
 
 
 def get_text_material():
@@ -111,19 +146,18 @@ def get_text_material():
 
 
 def add_text_to_cell(text, cell_x, cell_y, spacing):
-    bpy.ops.object.text_add(location=grid_cell_center(cell_x, cell_y, spacing))
-    txt_obj = bpy.context.active_object
-    txt_obj.data.body = text
-    txt_obj.name = f"Label_{text}"
-    txt_obj.data.extrude = 0.05
-    txt_obj.data.size = spacing / 5
-    txt_obj.location.z = 1.0
-    txt_obj.rotation_euler[2] = -0.785398
-    mat = get_text_material()
-    if txt_obj.data.materials:
-        txt_obj.data.materials[0] = mat
-    else:
-        txt_obj.data.materials.append(mat)
+    # Build the label at data level; the text_add operator would pay for
+    # an undo push and selection sync per label.
+    curve = bpy.data.curves.new(name=f"LabelData_{text}", type='FONT')
+    curve.body = text
+    curve.extrude = 0.05
+    curve.size = spacing / 5
+    curve.materials.append(get_text_material())
+    txt_obj = bpy.data.objects.new(f"Label_{text}", curve)
+    cx, cy, _ = grid_cell_center(cell_x, cell_y, spacing)
+    txt_obj.location = (cx, cy, 1.0)
+    txt_obj.rotation_euler[2] = -0.785398  # -45°
+    bpy.context.scene.collection.objects.link(txt_obj)
 
 
 def update_existing_text_colors(context):
@@ -137,31 +171,35 @@ def update_existing_text_colors(context):
 
 
 # --- Focus view and outliner ---
-def get_all_objects_in_collection(coll, recursive=True):
-    objs = list(coll.objects)
-    if recursive:
-        for child in coll.children:
-            objs.extend(get_all_objects_in_collection(child, True))
-    return objs
+def iter_collection_objects(coll, recursive=True):
+    stack = [coll]
+    while stack:
+        c = stack.pop()
+        yield from c.objects
+        if recursive:
+            stack.extend(c.children)
 
 
 def focus_view_on_collection(coll):
-    objs = get_all_objects_in_collection(coll, recursive=True)
-    if not objs:
-        return
     try:
         bpy.ops.object.select_all(action="DESELECT")
     except Exception:
         pass
 
+    # One pass over the generator: select, collect for the override, and
+    # pick the active object as we go.
+    objs = []
     active = None
-    for obj in objs:
+    for obj in iter_collection_objects(coll, recursive=True):
+        objs.append(obj)
         try:
             obj.select_set(True)
         except Exception:
             pass
         if not active and obj.type != "EMPTY":
             active = obj
+    if not objs:
+        return
     if not active:
         active = objs[0]
 
@@ -199,12 +237,16 @@ def focus_view_on_collection(coll):
 
 # --- UI Props ---
 def enum_tree_items(self, context):
+    global _ENUM_ITEMS_CACHE
+    if _ENUM_ITEMS_CACHE is not None:
+        return _ENUM_ITEMS_CACHE
     items = []
     for coll in bpy.data.collections:
         if is_ce_tree_collection(coll):
             items.append((coll.name, coll.name, "CE Tree Grid collection"))
     if not items:
         items = [("none", "<no CE trees found>", "")]
+    _ENUM_ITEMS_CACHE = items
     return items
 
 
@@ -264,40 +306,54 @@ class CE_OT_import_grid(bpy.types.Operator):
             if not os.path.exists(folder):
                 self.report({"WARNING"}, f"Missing style folder: {folder}")
                 continue
-            files = sorted(f for f in os.listdir(folder) if f.lower().endswith(".glb"))
-            for i, f in enumerate(files):
+            # scandir hands back name and full path from one directory
+            # read, with no per-entry os.path.join or extra stat.
+            with os.scandir(folder) as it:
+                files = sorted(e.path for e in it if e.is_file() and e.name.lower().endswith(".glb"))
+            for i, fpath in enumerate(files):
                 if i not in tree_files:
                     tree_files[i] = {}
-                tree_files[i][style] = os.path.join(folder, f)
+                tree_files[i][style] = fpath
 
         cols = len(tree_files)
         rows = len(styles) + 3
         make_checkerboard(cols, rows, spacing)
 
-        for tree_index, style_dict in tree_files.items():
-            col = tree_index
-            base_name = clean_base_name(list(style_dict.values()))
-            tree_collection = bpy.data.collections.new(base_name)
-            tree_collection["ce_tree_grid"] = True
-            context.scene.collection.children.link(tree_collection)
-
-            for row_index, style in enumerate(styles):
-                if style not in style_dict:
-                    continue
-                filepath = style_dict[style]
-                try:
-                    bpy.ops.import_scene.gltf(filepath=filepath)
-                    imported_objs = list(context.selected_objects)
-                    for obj in imported_objs:
-                        for c in obj.users_collection:
-                            if c != tree_collection:
-                                c.objects.unlink(obj)
-                        tree_collection.objects.link(obj)
-                    align_group_with_empty(imported_objs, col, row_index, spacing, style, tree_collection)
-                except Exception as e:
-                    self.report({"ERROR"}, f"Failed {filepath}: {e}")
-
-            add_text_to_cell(spaced_name(base_name), col, len(styles), spacing)
+        # Lock the UI and hold back view-layer evaluation while the grid
+        # imports; one update at the end replaces a redraw per model.
+        context.scene.render.use_lock_interface = True
+        try:
+            for tree_index, style_dict in tree_files.items():
+                col = tree_index
+                base_name = clean_base_name(list(style_dict.values()))
+                tree_collection = bpy.data.collections.new(base_name)
+                tree_collection["ce_tree_grid"] = True
+                context.scene.collection.children.link(tree_collection)
+
+                for row_index, style in enumerate(styles):
+                    if style not in style_dict:
+                        continue
+                    filepath = style_dict[style]
+                    try:
+                        bpy.ops.import_scene.gltf('EXEC_DEFAULT', filepath=filepath)
+                        imported_objs = list(context.selected_objects)
+
+                        # Relink to our tree collection only. Snapshot membership
+                        # once — users_collection is rebuilt on every RNA access.
+                        prev_colls = [(obj, tuple(obj.users_collection)) for obj in imported_objs]
+                        for obj, colls in prev_colls:
+                            for c in colls:
+                                if c != tree_collection:
+                                    c.objects.unlink(obj)
+                            tree_collection.objects.link(obj)
+                        align_group_with_empty(imported_objs, col, row_index, spacing, style, tree_collection)
+                    except Exception as e:
+                        self.report({"ERROR"}, f"Failed {filepath}: {e}")
+
+                add_text_to_cell(spaced_name(base_name), col, len(styles), spacing)
+        finally:
+            context.scene.render.use_lock_interface = False
+            context.view_layer.update()
 
         return {"FINISHED"}
 
@@ -385,9 +441,13 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
     bpy.types.Scene.ce_tree_props = bpy.props.PointerProperty(type=CETreeProperties)
+    if _invalidate_ce_tree_cache not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_invalidate_ce_tree_cache)
 
 
 def unregister():
+    if _invalidate_ce_tree_cache in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_invalidate_ce_tree_cache)
     for cls in reversed(classes):
         bpy.utils.unregister_class(cls)
     del bpy.types.Scene.ce_tree_props
@@ -1,7 +1,7 @@
 import bpy
 import mathutils
 import random
-import bmesh
+import numpy as np
 
 # ------------------------------
 # ADDON METADATA
@@ -21,10 +21,30 @@ bl_info = {
 # ------------------------------
 # GLOBAL STORAGE
 # ------------------------------
-original_positions_store = []
-original_geometry_store = {}
+# SoA storage for original locations: one contiguous float32 array plus
+# a name -> row mapping, instead of a heap-allocated Vector per object.
+original_positions_store = {}
+original_positions = np.empty((0, 3), dtype=np.float32)
+original_centroid_store = {}
 selected_reference_name = None
-scene_offset_vector = mathutils.Vector((0, 0, 0))
+# Kept as float32 so the batched NumPy paths use it without conversion.
+scene_offset_vector = np.zeros(3, dtype=np.float32)
+
+# Scene mesh list shared across back-to-back operator calls; dropped by
+# the depsgraph handler whenever objects or collections change.
+_mesh_cache = None
+
+@bpy.app.handlers.persistent
+def _invalidate_mesh_cache(scene, depsgraph):
+    global _mesh_cache
+    if depsgraph.id_type_updated('OBJECT') or depsgraph.id_type_updated('COLLECTION'):
+        _mesh_cache = None
+
+def _get_mesh_objs(context):
+    global _mesh_cache
+    if _mesh_cache is None:
+        _mesh_cache = [o for o in context.scene.objects if o.type == 'MESH']
+    return _mesh_cache
 
 # ------------------------------
 # OPERATORS
@@ -37,15 +57,24 @@ class OBJECT_OT_SelectRandomModel(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        mesh_objects = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH']
-        if not mesh_objects:
+        # Reservoir-sample one mesh in a single pass; no need to build the
+        # full object list just to pick one element.
+        ref_obj = None
+        seen = 0
+        for obj in context.scene.objects:
+            if obj.type == 'MESH':
+                seen += 1
+                if random.randrange(seen) == 0:
+                    ref_obj = obj
+        if ref_obj is None:
             self.report({'WARNING'}, "No mesh objects in scene.")
             return {'CANCELLED'}
-
-        ref_obj = random.choice(mesh_objects)
-        bpy.ops.object.select_all(action='DESELECT')
+        # Deselect directly; the select_all operator would push undo and
+        # re-evaluate the depsgraph just to clear flags.
+        for obj in context.selected_objects:
+            obj.select_set(False)
         ref_obj.select_set(True)
-        bpy.context.view_layer.objects.active = ref_obj
+        context.view_layer.objects.active = ref_obj
 
         global selected_reference_name
         selected_reference_name = ref_obj.name
@@ -60,8 +89,14 @@ class OBJECT_OT_MoveReferenceToOrigin(bpy.types.Operator):
     bl_label = "Move Reference to Origin"
     bl_options = {'REGISTER', 'UNDO'}
 
+    use_evaluated: bpy.props.BoolProperty(
+        name="Use Evaluated Mesh",
+        description="Compute the centroid from the modifier-evaluated mesh. Costs a depsgraph evaluation, so leave off unless modifiers move the geometry",
+        default=False,
+    )
+
     def execute(self, context):
-        global original_positions_store, original_geometry_store, selected_reference_name
+        global original_positions_store, original_centroid_store, selected_reference_name
 
         if not selected_reference_name:
             self.report({'WARNING'}, "No reference object selected. Run 'Select Random Model' first.")
@@ -72,49 +107,77 @@ class OBJECT_OT_MoveReferenceToOrigin(bpy.types.Operator):
             self.report({'WARNING'}, f"Reference object '{selected_reference_name}' not found.")
             return {'CANCELLED'}
 
-        # Clear previous stored data
-        original_positions_store.clear()
-        original_geometry_store.clear()
-
-        # Store original positions of all mesh objects
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH':
-                original_positions_store.append((obj.name, obj.location.copy()))
-
-        # Store original geometry data for the reference object
-        if ref_obj.data:
-            original_mesh = ref_obj.data.copy()
-            original_geometry_store[ref_obj.name] = original_mesh
-
-        # Calculate geometry center of the reference object
-        bpy.context.view_layer.objects.active = ref_obj
-        bpy.ops.object.select_all(action='DESELECT')
-        ref_obj.select_set(True)
-
-        bm = bmesh.new()
-        bm.from_mesh(ref_obj.data)
-        if bm.verts:
-            geometry_center = sum((v.co for v in bm.verts), mathutils.Vector()) / len(bm.verts)
+        # Read the centroid straight off the vertex array: foreach_get
+        # fills a flat float32 buffer in C and NumPy takes the mean, with
+        # no per-vertex Vector arithmetic. Optionally the evaluated mesh
+        # is sampled instead, for references whose modifiers move the
+        # geometry.
+        eval_obj = None
+        if self.use_evaluated:
+            depsgraph = context.evaluated_depsgraph_get()
+            eval_obj = ref_obj.evaluated_get(depsgraph)
+            me = eval_obj.to_mesh()
+        else:
+            me = ref_obj.data
+        vert_count = len(me.vertices)
+        if vert_count:
+            coords = np.empty(vert_count * 3, dtype=np.float32)
+            me.vertices.foreach_get("co", coords)
+            geometry_center = mathutils.Vector(coords.reshape(-1, 3).mean(axis=0).tolist())
         else:
             geometry_center = mathutils.Vector((0, 0, 0))
+        if eval_obj is not None:
+            eval_obj.to_mesh_clear()
         geometry_center_world = ref_obj.matrix_world @ geometry_center
 
-        for v in bm.verts:
-            v.co -= geometry_center
-        bm.to_mesh(ref_obj.data)
-        bm.free()
-        ref_obj.data.update()
+        # Re-running the operator on an already-centered reference would
+        # redo the whole scene translation for nothing; bail out before
+        # any session state is touched.
+        if geometry_center_world.length_squared < 1e-12:
+            self.report({'INFO'}, "Already centered.")
+            return {'FINISHED'}
+
+        # Clear previous stored data
+        original_positions_store.clear()
+        original_centroid_store.clear()
+
+        # Reuse the cached mesh list; every later step works off it.
+        mesh_objs = _get_mesh_objs(context)
+
+        # Store original positions of all mesh objects in one array; the
+        # same rows double as the input of the batched translation below,
+        # so locations are read from RNA exactly once.
+        global original_positions
+        original_positions = np.empty((len(mesh_objs), 3), dtype=np.float32)
+        for i, obj in enumerate(mesh_objs):
+            original_positions[i] = obj.location
+            original_positions_store[obj.name] = i
+
+        # Shift the mesh itself in one C-side call; nothing to move when
+        # the mesh has no vertices.
+        if len(ref_obj.data.vertices):
+            # Only coordinates move, so the centroid alone is enough to
+            # undo the shift on Restore — no duplicate of the whole mesh.
+            original_centroid_store[ref_obj.name] = geometry_center.copy()
+            # Mesh.transform already tags the mesh; a coordinate-only edit
+            # needs no extra update() pass.
+            ref_obj.data.transform(mathutils.Matrix.Translation(-geometry_center))
         ref_obj.location = mathutils.Vector((0, 0, 0))
 
-        offset_vector = -geometry_center_world
         global scene_offset_vector
+        offset_vector = np.asarray(-geometry_center_world, dtype=np.float32)
         scene_offset_vector = offset_vector
 
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH' and obj != ref_obj:
-                obj.location += offset_vector
+        # Batched translation: the stored originals plus one broadcast add
+        # give every new location; no second gather pass is needed.
+        # Object.location has no foreach_set, so the write-back stays per
+        # object.
+        new_locs = original_positions + offset_vector
+        for i, obj in enumerate(mesh_objs):
+            if obj is not ref_obj:
+                obj.location = new_locs[i]
 
-        self.report({'INFO'}, f"Centered {ref_obj.name} at origin and repositioned {len([o for o in bpy.context.scene.objects if o.type == 'MESH'])} mesh objects.")
+        self.report({'INFO'}, f"Centered {ref_obj.name} at origin and repositioned {len(mesh_objs)} mesh objects.")
         return {'FINISHED'}
 
 
@@ -131,21 +194,30 @@ class OBJECT_OT_RegisterNewMeshes(bpy.types.Operator):
             self.report({'WARNING'}, "No active session. Move reference to origin first.")
             return {'CANCELLED'}
 
-        stored_names = {name for name, _ in original_positions_store}
-        new_meshes = [obj for obj in bpy.context.scene.objects if obj.type == 'MESH' and obj.name not in stored_names]
+        new_meshes = [obj for obj in _get_mesh_objs(context) if obj.name not in original_positions_store]
 
         if not new_meshes:
             self.report({'INFO'}, "No new mesh objects found.")
             return {'FINISHED'}
 
-        new_count = 0
-        for obj in new_meshes:
-            original_location = obj.location.copy() - scene_offset_vector
-            original_positions_store.append((obj.name, original_location))
-            new_count += 1
-            self.report({'INFO'}, f"Registered new mesh {obj.name} for restore.")
-
-        self.report({'INFO'}, f"Registered {new_count} new mesh objects for restore.")
+        # One summary report after the loop; a report per object writes to
+        # the UI log every iteration.
+        global original_positions
+        store = original_positions_store
+        base = original_positions.shape[0]
+        new_rows = np.empty((len(new_meshes), 3), dtype=np.float32)
+        registered_names = []
+        for i, obj in enumerate(new_meshes):
+            new_rows[i] = obj.location
+            store[obj.name] = base + i
+            registered_names.append(obj.name)
+        new_rows -= scene_offset_vector
+        original_positions = np.vstack((original_positions, new_rows))
+
+        summary = ", ".join(registered_names[:5])
+        if len(registered_names) > 5:
+            summary += ", ..."
+        self.report({'INFO'}, f"Registered {len(registered_names)} new mesh objects for restore: {summary}")
         return {'FINISHED'}
 
 
@@ -156,30 +228,30 @@ class OBJECT_OT_RestoreOriginalPosition(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        global original_positions_store, original_geometry_store
+        global original_positions_store, original_positions, original_centroid_store, scene_offset_vector
 
         if not original_positions_store:
             self.report({'WARNING'}, "No stored positions found. Move reference to origin first.")
             return {'CANCELLED'}
 
         restored_count = 0
-        for name, orig_loc in original_positions_store:
+        for name, row in original_positions_store.items():
             obj = bpy.data.objects.get(name)
             if obj:
-                obj.location = orig_loc
+                obj.location = original_positions[row]
                 restored_count += 1
 
-        for obj_name, original_mesh in original_geometry_store.items():
+        # Translate the stored centroid back into the mesh to undo the
+        # geometry shift.
+        for obj_name, centroid in original_centroid_store.items():
             obj = bpy.data.objects.get(obj_name)
             if obj and obj.data:
-                old_mesh = obj.data
-                obj.data = original_mesh
-                bpy.data.meshes.remove(old_mesh)
+                obj.data.transform(mathutils.Matrix.Translation(centroid))
 
         original_positions_store.clear()
-        original_geometry_store.clear()
-        global scene_offset_vector
-        scene_offset_vector = mathutils.Vector((0, 0, 0))
+        original_centroid_store.clear()
+        original_positions = np.empty((0, 3), dtype=np.float32)
+        scene_offset_vector = np.zeros(3, dtype=np.float32)
 
         self.report({'INFO'}, f"Restored {restored_count} objects to original positions and geometry.")
         return {'FINISHED'}
@@ -192,10 +264,11 @@ class OBJECT_OT_ClearSession(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     def execute(self, context):
-        global original_positions_store, original_geometry_store, scene_offset_vector
+        global original_positions_store, original_positions, original_centroid_store, scene_offset_vector
         original_positions_store.clear()
-        original_geometry_store.clear()
-        scene_offset_vector = mathutils.Vector((0, 0, 0))
+        original_centroid_store.clear()
+        original_positions = np.empty((0, 3), dtype=np.float32)
+        scene_offset_vector = np.zeros(3, dtype=np.float32)
         self.report({'INFO'}, "Cleared all stored LOD model data.")
         return {'FINISHED'}
 
@@ -250,10 +323,14 @@ classes = (
     VIEW3D_PT_EditLargeLODModelPanel,
 )
 
+_register_classes, _unregister_classes = bpy.utils.register_classes_factory(classes)
+
 def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
+    _register_classes()
+    if _invalidate_mesh_cache not in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.append(_invalidate_mesh_cache)
 
 def unregister():
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
+    if _invalidate_mesh_cache in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(_invalidate_mesh_cache)
+    _unregister_classes()